@@ -112,6 +112,13 @@ def parse_args(args: List[str]) -> Dict:
             schema_str = args[3]
             schema = parse_schema(schema_str)
             result.update({"table_name": table_name, "schema": schema})
+
+            # optional bloom filter: false positive rate and extra columns
+            if len(args) >= 5:
+                result["bloom_fp_rate"] = float(args[4])
+            if len(args) >= 6:
+                result["bloom_columns"] = [
+                    c.strip() for c in args[5].split(',') if c.strip()]
         case "DELETE":
             if len(args) < 3:
                 raise ValueError(
@@ -218,8 +225,12 @@ def main():
                 print("Found row:")
                 for k, v in row.items():
                     print(f"  {k}: {v}")
+            # lookups don't save the table, persist the bloom counters only
+            db.save_bloom_stats(table)
         elif op == "CREATE":
-            table = db.create_table(cmd["table_name"], cmd["schema"])
+            table = db.create_table(cmd["table_name"], cmd["schema"],
+                                    cmd.get("bloom_fp_rate"),
+                                    cmd.get("bloom_columns"))
             print(f"Created table:\n{table}")
 
         elif op == "DELETE":
@@ -25,10 +25,12 @@ class Database:
                 except Exception as e:
                     print(f"Failed to load table {table_name}: {e}")
 
-    def create_table(self, name: str, fields: List[Field]) -> Table:
+    def create_table(self, name: str, fields: List[Field],
+                     bloom_fp_rate: Optional[float] = None,
+                     bloom_columns: Optional[List[str]] = None) -> Table:
         if name in self.tables:
             raise ValueError(f"Table '{name}' already exists.")
-        table = Table(name, fields)
+        table = Table(name, fields, bloom_fp_rate, bloom_columns)
         self.tables[name] = table
         if self.storage:
             self.storage.save_table(table)
@@ -48,6 +50,10 @@ class Database:
         if self.storage:
             self.storage.save_table(table)
 
+    def save_bloom_stats(self, table: Table):
+        if self.storage:
+            self.storage.save_bloom_stats(table)
+
     def __repr__(self):
         table_list = ", ".join(self.tables.keys())
         return f"<Database tables: {table_list}>"
@@ -1,5 +1,6 @@
 from typing import List, Dict, Any, Optional
 from ..indexing.hash_index import HashIndex
+from ..indexing.bloom_filter import BloomFilter
 
 
 class Field:
@@ -19,13 +20,22 @@ class Table:
     name : str = table name
     fields : List[Field] = list of Fields of the table
     data : List[Dict[str,Any]] = data of the table
+    bloom_fp_rate : Optional[float] = enables bloom filters with this
+        false positive rate (None = disabled)
+    bloom_columns : List[str] = extra non primary key columns to filter
+        (requires bloom_fp_rate)
     """
 
-    def __init__(self, name: str, fields: List[Field]):
+    def __init__(self, name: str, fields: List[Field],
+                 bloom_fp_rate: Optional[float] = None,
+                 bloom_columns: Optional[List[str]] = None):
         self.name = name
         self.fields = fields
         self.data: List[Dict[str, Any]] = []
         self.hash_index = HashIndex()
+        self.bloom_fp_rate = bloom_fp_rate
+        self.bloom_columns: List[str] = list(bloom_columns or [])
+        self.bloom_filters: Dict[str, BloomFilter] = {}
 
         # fill the fields
         for f in fields:
@@ -36,15 +46,80 @@ class Table:
             raise ValueError(
                 f"Table '{name}' must have one primary key field.")
 
+        if self.bloom_columns and bloom_fp_rate is None:
+            raise ValueError("Bloom filter columns require a bloom fp rate")
+        field_names = [f.name for f in fields]
+        for col in self.bloom_columns:
+            if col not in field_names:
+                raise ValueError(f"Bloom filter column '{col}' does not exist")
+
         # fill hash index
         for row in self.data:
             # NOTE: this is important
             # we are inserting the reference, not the WHOLE row data
             self.hash_index.insert(row[self.primary_key_field], row)
+        self.rebuild_bloom_filters()
 
     def __repr__(self):
         fields_repr = "\n".join(repr(f) for f in self.fields)
-        return f"<Table \"{self.name}\">\n{fields_repr}"
+        bloom_repr = ""
+        if self.bloom_fp_rate is not None:
+            bloom_repr = (f"\nbloom filter: fp_rate={self.bloom_fp_rate} "
+                          f"columns={self.bloom_filter_columns()}")
+            for col, stats in self.bloom_stats().items():
+                bloom_repr += (f"\n  \"{col}\": {stats['checks']} lookups, "
+                               f"{stats['short_circuited']} short-circuited")
+        return f"<Table \"{self.name}\">\n{fields_repr}{bloom_repr}"
+
+    def bloom_filter_columns(self) -> List[str]:
+        cols = [self.primary_key_field]
+        cols.extend(c for c in self.bloom_columns if c not in cols)
+        return cols
+
+    def rebuild_bloom_filters(self):
+        old_filters = self.bloom_filters
+        self.bloom_filters = {}
+        if self.bloom_fp_rate is None:
+            return
+
+        # leave headroom so inserts don't immediately degrade the fp rate
+        capacity = max(128, 2 * len(self.data))
+        for col in self.bloom_filter_columns():
+            bf = BloomFilter(capacity, self.bloom_fp_rate)
+            for row in self.data:
+                bf.add(row.get(col))
+            # keep lookup counters across rebuilds
+            if col in old_filters:
+                bf.checks = old_filters[col].checks
+                bf.negatives = old_filters[col].negatives
+            self.bloom_filters[col] = bf
+
+    def _bloom_add(self, values: Dict[str, Any]):
+        """
+        Adds the filtered columns present in `values` (a full row on insert,
+        the changed fields on update).
+        """
+        if not self.bloom_filters:
+            return
+        for col, bf in self.bloom_filters.items():
+            if col in values:
+                bf.add(values[col])
+        # filters can't grow in place, so resize once they are over capacity
+        if any(bf.is_full() for bf in self.bloom_filters.values()):
+            self.rebuild_bloom_filters()
+
+    def might_contain(self, column: str, value: Any) -> bool:
+        """
+        False means `value` is definitely not in `column`,
+        True means it may be (or that the column has no bloom filter).
+        """
+        bf = self.bloom_filters.get(column)
+        if bf is None:
+            return True
+        return bf.might_contain(value)
+
+    def bloom_stats(self) -> Dict[str, Dict[str, int]]:
+        return {col: bf.stats() for col, bf in self.bloom_filters.items()}
 
     def insert(self, row: Dict[str, Any]):
         # check any missing fields
@@ -56,11 +131,27 @@ class Table:
 
         self.data.append(row)
         self.hash_index.insert(pk_val, row)
+        self._bloom_add(row)
 
     def find_row(self, pk: Any) -> Optional[Dict[str, Any]]:
+        if not self.might_contain(self.primary_key_field, pk):
+            return None
         return self.hash_index.find_by_key(pk)
 
+    def find_rows(self, column: str, value: Any) -> List[Dict[str, Any]]:
+        if column not in [f.name for f in self.fields]:
+            raise ValueError(f"Field '{column}' does not exist in table")
+        if column == self.primary_key_field:
+            row = self.find_row(value)
+            return [] if row is None else [row]
+        if not self.might_contain(column, value):
+            return []
+        return [r for r in self.data if r.get(column) == value]
+
     def delete_row(self, pk_value: Any) -> bool:
+        if not self.might_contain(self.primary_key_field, pk_value):
+            return False
+
         # first we will delete from hash index
         deleted_in_index = self.hash_index.delete(pk_value)
         if not deleted_in_index:
@@ -73,7 +164,7 @@ class Table:
         return len(self.data) < initial_len
 
     def update_row(self, pk_value: Any, updates: Dict[str, Any]) -> bool:
-        row = self.hash_index.find_by_key(pk_value)
+        row = self.find_row(pk_value)
         if row is None:
             return False
 
@@ -83,6 +174,8 @@ class Table:
             if k not in [f.name for f in self.fields]:
                 raise ValueError(f"Field '{k}' does not exist in table")
             row[k] = v
+            # old values stay set in the filter, that only costs false positives
+            self._bloom_add({k: v})
         return True
 
     def add_column(self, field: Field):
@@ -94,7 +187,9 @@ class Table:
         for row in self.data:
             row[field.name] = None
 
-    def rebuild_hash_index(self):
+    def rebuild_hash_index(self, rebuild_bloom: bool = True):
         self.hash_index = HashIndex()
         for row in self.data:
             self.hash_index.insert(row[self.primary_key_field], row)
+        if rebuild_bloom:
+            self.rebuild_bloom_filters()
@@ -0,0 +1,101 @@
+import base64
+import hashlib
+import math
+
+
+class BloomFilter:
+    '''
+    @params
+    capacity = expected number of distinct keys
+    fp_rate = target false positive rate at capacity
+    size = number of bits (m)
+    num_hashes = number of hash probes per key (k)
+    count = number of keys added so far
+    checks / negatives = lookup counters (negatives are definite misses)
+    '''
+
+    def __init__(self, capacity=128, fp_rate=0.01):
+        if not 0 < fp_rate < 1:
+            raise ValueError("Bloom filter fp_rate must be between 0 and 1")
+        capacity = max(1, capacity)
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        self.size = max(8, math.ceil(
+            -capacity * math.log(fp_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+        self.checks = 0
+        self.negatives = 0
+
+    def _key_bytes(self, key):
+        # NOTE: keys that compare equal must hash the same here, otherwise
+        # the filter could report a false negative (e.g. 5, 5.0 and True/1)
+        if isinstance(key, bool):
+            key = int(key)
+        elif isinstance(key, float) and key.is_integer():
+            key = int(key)
+        return f"{type(key).__name__}:{key!r}".encode("utf-8")
+
+    def _positions(self, key):
+        # double hashing: h1 + i * h2 gives k independent-enough probes
+        digest = hashlib.blake2b(self._key_bytes(key), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, key):
+        # only count keys that set a new bit, so re-adding a value that is
+        # already in the filter doesn't eat into its capacity
+        added = False
+        for pos in self._positions(key):
+            mask = 1 << (pos & 7)
+            if not self.bits[pos >> 3] & mask:
+                self.bits[pos >> 3] |= mask
+                added = True
+        if added:
+            self.count += 1
+
+    def might_contain(self, key):
+        self.checks += 1
+        for pos in self._positions(key):
+            if not self.bits[pos >> 3] & (1 << (pos & 7)):
+                self.negatives += 1
+                return False
+        return True
+
+    def is_full(self):
+        return self.count > self.capacity
+
+    def stats(self):
+        return {
+            "checks": self.checks,
+            "short_circuited": self.negatives,
+            "keys": self.count,
+            "capacity": self.capacity,
+            "bits": self.size,
+            "hashes": self.num_hashes,
+        }
+
+    def to_dict(self):
+        return {
+            "capacity": self.capacity,
+            "fp_rate": self.fp_rate,
+            "count": self.count,
+            "bits": base64.b64encode(bytes(self.bits)).decode("ascii"),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        bf = cls(data["capacity"], data["fp_rate"])
+        bits = base64.b64decode(data["bits"])
+        if len(bits) != len(bf.bits):
+            raise ValueError("Bloom filter bit array size mismatch")
+        bf.bits = bytearray(bits)
+        bf.count = data["count"]
+        return bf
+
+    def __repr__(self):
+        return (f"<BloomFilter keys={self.count} bits={self.size} "
+                f"hashes={self.num_hashes} fp_rate={self.fp_rate}>")
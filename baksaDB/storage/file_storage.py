@@ -1,8 +1,12 @@
 import csv
+import hashlib
+import io
 import json
 import os
+import tempfile
 from typing import Any
 from ..core.models import Table, Field
+from ..indexing.bloom_filter import BloomFilter
 
 
 class FileStorage:
@@ -18,6 +22,31 @@ class FileStorage:
         safe_name = table_name.replace(" ", "_")
         return os.path.join(self.storage_dir, f"{safe_name}.schema.json")
 
+    def _table_bloom_path(self, table_name: str) -> str:
+        safe_name = table_name.replace(" ", "_")
+        return os.path.join(self.storage_dir, f"{safe_name}.bloom.json")
+
+    def _table_bloom_stats_path(self, table_name: str) -> str:
+        safe_name = table_name.replace(" ", "_")
+        return os.path.join(self.storage_dir, f"{safe_name}.bloom_stats.json")
+
+    def _atomic_write(self, path: str, text: str) -> None:
+        # write to a unique temp file and swap it in, so a crash or a
+        # concurrent writer never leaves a half written file behind
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self.storage_dir, prefix=".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", newline='', encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _fingerprint(self, data: bytes) -> str:
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
     def save_table(self, table: Table) -> None:
         # Save schema metadata
         schema_path = self._table_schema_path(table.name)
@@ -27,19 +56,41 @@ class FileStorage:
                 for f in table.fields
             ]
         }
-        with open(schema_path, "w", encoding="utf-8") as f:
-            json.dump(schema_data, f, indent=2)
+        if table.bloom_fp_rate is not None:
+            schema_data["bloom_filter"] = {
+                "fp_rate": table.bloom_fp_rate,
+                "columns": table.bloom_columns,
+            }
+        self._atomic_write(schema_path, json.dumps(schema_data, indent=2))
 
         # Save data rows into CSV
         csv_path = self._table_csv_path(table.name)
-        with open(csv_path, "w", newline='', encoding="utf-8") as csvfile:
-            fieldnames = [f.name for f in table.fields]
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            for row in table.data:
-                # Convert all values to strings for CSV
-                writer.writerow(
-                    {k: str(v) if v is not None else "" for k, v in row.items()})
+        csvfile = io.StringIO()
+        fieldnames = [f.name for f in table.fields]
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        writer.writeheader()
+        for row in table.data:
+            # Convert all values to strings for CSV
+            writer.writerow(
+                {k: str(v) if v is not None else "" for k, v in row.items()})
+        csv_text = csvfile.getvalue()
+        self._atomic_write(csv_path, csv_text)
+
+        # Save bloom filter bits next to the table, only after the CSV is in
+        # place. the fingerprint ties the filter to this exact CSV content
+        bloom_path = self._table_bloom_path(table.name)
+        bloom_filters = self._csv_bloom_filters(table)
+        if bloom_filters:
+            bloom_data = {
+                "csv_fingerprint": self._fingerprint(csv_text.encode("utf-8")),
+                "filters": {
+                    col: bf.to_dict() for col, bf in bloom_filters.items()
+                },
+            }
+            self._atomic_write(bloom_path, json.dumps(bloom_data))
+        elif os.path.isfile(bloom_path):
+            os.remove(bloom_path)
+        self.save_bloom_stats(table)
 
     def load_table(self, table_name: str) -> Table:
         schema_path = self._table_schema_path(table_name)
@@ -58,7 +109,12 @@ class FileStorage:
         fields = [
             Field(f["name"], f["type"], f["is_primary"]) for f in schema_json["fields"]
         ]
-        table = Table(table_name, fields)
+        bloom_conf = schema_json.get("bloom_filter")
+        if bloom_conf:
+            table = Table(table_name, fields, bloom_conf["fp_rate"],
+                          bloom_conf.get("columns", []))
+        else:
+            table = Table(table_name, fields)
 
         # Load rows from CSV
         with open(csv_path, "r", newline='', encoding="utf-8") as csvfile:
@@ -75,12 +131,112 @@ class FileStorage:
                     typed_row[field.name] = typed_val
                 table.data.append(typed_row)
 
-        # for rebuilding hash index
-        table.rebuild_hash_index()
+        # for rebuilding hash index, reusing persisted bloom filters if valid
+        bloom_json = self._read_bloom_file(table.name)
+        bloom_filters = self._load_bloom_filters(table, bloom_json, csv_path)
+        if bloom_filters is not None:
+            table.bloom_filters = bloom_filters
+            table.rebuild_hash_index(rebuild_bloom=False)
+        else:
+            table.rebuild_hash_index()
+        self._load_bloom_stats(table)
         return table
 
+    def _csv_bloom_filters(self, table: Table):
+        # NOTE: the in-memory filters can't be written out as they are. rows
+        # inserted from the CLI hold raw strings ("1") that the CSV reads back
+        # typed (1), so the persisted filters are rehashed from the values as
+        # load_table will see them. this is O(rows) per save, the same order
+        # as rewriting the CSV. the in-memory filters stay as they are, they
+        # still have to match the un-cast values held in table.data
+        field_types = {f.name: f.type for f in table.fields}
+        filters = {}
+        for col, table_bf in table.bloom_filters.items():
+            bf = BloomFilter(table_bf.capacity, table_bf.fp_rate)
+            for row in table.data:
+                val = row.get(col)
+                if val is None or str(val) == "":
+                    bf.add(None)
+                    continue
+                try:
+                    bf.add(self._convert_value(str(val), field_types[col]))
+                except ValueError:
+                    # not loadable as typed, let load_table rebuild instead
+                    return {}
+            filters[col] = bf
+        return filters
+
+    def _read_bloom_file(self, table_name: str):
+        bloom_path = self._table_bloom_path(table_name)
+        if not os.path.isfile(bloom_path):
+            return None
+        try:
+            with open(bloom_path, "r", encoding="utf-8") as f:
+                bloom_json = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return bloom_json if isinstance(bloom_json, dict) else None
+
+    def _load_bloom_filters(self, table: Table, bloom_json, csv_path: str):
+        if table.bloom_fp_rate is None or bloom_json is None:
+            return None
+
+        try:
+            with open(csv_path, "rb") as f:
+                csv_fingerprint = self._fingerprint(f.read())
+            # stale file (csv edited or written without it), rebuild instead
+            if bloom_json["csv_fingerprint"] != csv_fingerprint:
+                return None
+            filters = {
+                col: BloomFilter.from_dict(d)
+                for col, d in bloom_json["filters"].items()
+            }
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+        if set(filters) != set(table.bloom_filter_columns()):
+            return None
+        if any(bf.fp_rate != table.bloom_fp_rate for bf in filters.values()):
+            return None
+        return filters
+
+    def _load_bloom_stats(self, table: Table) -> None:
+        stats_path = self._table_bloom_stats_path(table.name)
+        if not table.bloom_filters or not os.path.isfile(stats_path):
+            return
+        try:
+            with open(stats_path, "r", encoding="utf-8") as f:
+                stats_json = json.load(f)
+            for col, d in stats_json.items():
+                bf = table.bloom_filters.get(col)
+                if bf is not None:
+                    bf.checks = int(d["checks"])
+                    bf.negatives = int(d["negatives"])
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            pass
+
+    def save_bloom_stats(self, table: Table) -> None:
+        """
+        Writes the bloom lookup counters to their own small file, so reads
+        (e.g. FIND from the CLI) never rewrite the filter bits. Counters are
+        best effort: a failed write is ignored and never fails the lookup.
+        """
+        if not table.bloom_filters:
+            return
+        stats_data = {
+            col: {"checks": bf.checks, "negatives": bf.negatives}
+            for col, bf in table.bloom_filters.items()
+        }
+        try:
+            self._atomic_write(self._table_bloom_stats_path(table.name),
+                               json.dumps(stats_data))
+        except OSError:
+            pass
+
     def delete_table(self, table_name: str) -> None:
-        for path_func in [self._table_csv_path, self._table_schema_path]:
+        for path_func in [self._table_csv_path, self._table_schema_path,
+                          self._table_bloom_path,
+                          self._table_bloom_stats_path]:
             path = path_func(table_name)
             if os.path.isfile(path):
                 os.remove(path)
@@ -0,0 +1,194 @@
+import os
+import shutil
+
+import pytest
+
+from baksaDB import Database, Field, Table
+from baksaDB.indexing.bloom_filter import BloomFilter
+
+
+def make_table(db, rows=0):
+    table = db.create_table(
+        "t", [Field("id", "int", True), Field("v", "string")], 0.01, ["v"])
+    for i in range(rows):
+        table.insert({"id": i, "v": f"n{i}"})
+    return table
+
+
+def rewrite_csv(path, old, new):
+    with open(path, "rb") as f:
+        data = f.read()
+    assert old in data
+    with open(path, "wb") as f:
+        f.write(data.replace(old, new))
+
+
+def test_equal_keys_of_different_types():
+    bf = BloomFilter(16, 0.01)
+    bf.add(5)
+    bf.add(True)
+    bf.add(2.0)
+    assert bf.might_contain(5.0)
+    assert bf.might_contain(1)
+    assert bf.might_contain(1.0)
+    assert bf.might_contain(2)
+    assert bf.might_contain(True)
+
+
+def test_table_equal_keys_of_different_types():
+    table = Table("t", [Field("id", "double", True)], 0.01)
+    table.insert({"id": 5})
+    table.insert({"id": 1.0})
+    assert table.find_row(5.0) is not None
+    assert table.find_row(True) is not None
+
+
+def test_invalid_bloom_config():
+    fields = [Field("id", "int", True), Field("v", "string")]
+    with pytest.raises(ValueError):
+        Table("t", fields, 1.5)
+    with pytest.raises(ValueError):
+        Table("t", fields, None, ["v"])
+    with pytest.raises(ValueError):
+        Table("t", fields, 0.01, ["missing"])
+
+
+def test_serialization_round_trip():
+    bf = BloomFilter(64, 0.05)
+    for i in range(64):
+        bf.add(i)
+    bf.might_contain(1000)
+    restored = BloomFilter.from_dict(bf.to_dict())
+    assert restored.bits == bf.bits
+    assert restored.count == bf.count
+    assert restored.size == bf.size
+    assert restored.num_hashes == bf.num_hashes
+    # lookup counters live in their own stats file, not with the bits
+    assert "checks" not in bf.to_dict()
+
+
+def test_no_false_negatives_in_memory():
+    table = Table("t", [Field("id", "int", True), Field("v", "string")],
+                  0.01, ["v"])
+    # past the default capacity so the filters get resized
+    for i in range(1000):
+        table.insert({"id": i, "v": f"n{i}"})
+    table.update_row(3, {"v": "changed"})
+    table.delete_row(4)
+
+    assert all(table.find_row(i) is not None for i in range(1000) if i != 4)
+    assert table.find_row(4) is None
+    assert table.find_rows("v", "changed") == [table.find_row(3)]
+
+    table.rebuild_hash_index()
+    assert all(table.find_row(i) is not None for i in range(1000) if i != 4)
+    assert table.find_rows("v", "changed") == [table.find_row(3)]
+
+
+def test_updates_resize_the_filter():
+    table = Table("t", [Field("id", "int", True), Field("v", "string")],
+                  0.01, ["v"])
+    for i in range(10):
+        table.insert({"id": i, "v": f"n{i}"})
+    for i in range(5000):
+        table.update_row(0, {"v": f"u{i % 50}" if i < 2500 else f"w{i}"})
+
+    bf = table.bloom_filters["v"]
+    assert bf.count <= bf.capacity
+    assert table.find_rows("v", "w4999") == [table.find_row(0)]
+    misses = sum(not table.might_contain("v", f"x{i}") for i in range(10000))
+    assert misses > 9000
+
+
+def test_short_circuit_counters():
+    table = Table("t", [Field("id", "int", True)], 0.01)
+    table.insert({"id": 1})
+    assert table.find_row(2) is None
+    assert table.find_row(1) is not None
+    stats = table.bloom_stats()["id"]
+    assert stats["checks"] == 2
+    assert stats["short_circuited"] == 1
+
+
+def test_save_reload_round_trip(tmp_path):
+    db = Database(str(tmp_path))
+    table = make_table(db, 300)
+    table.update_row(7, {"v": "seven"})
+    table.find_row(-1)
+    db.save_table(table)
+
+    loaded = Database(str(tmp_path)).get_table("t")
+    assert loaded.bloom_filters
+    assert all(loaded.find_row(i) is not None for i in range(300))
+    assert loaded.find_rows("v", "seven") == [loaded.find_row(7)]
+    # counters survive the reload
+    assert loaded.bloom_stats()["id"]["short_circuited"] >= 1
+
+
+def test_bloom_stats_file(tmp_path, monkeypatch):
+    db = Database(str(tmp_path))
+    table = make_table(db, 5)
+    db.save_table(table)
+    table.find_row(-1)
+    db.save_bloom_stats(table)
+
+    loaded = Database(str(tmp_path)).get_table("t")
+    assert loaded.bloom_stats()["id"]["short_circuited"] == 1
+
+    # a failed counter write must not fail the lookup
+    def read_only(*args):
+        raise PermissionError(13, "Read-only file system")
+    monkeypatch.setattr(os, "replace", read_only)
+    loaded.find_row(-2)
+    db.save_bloom_stats(loaded)
+    assert not any(p.name.endswith(".tmp") for p in tmp_path.iterdir())
+
+
+def test_cli_string_values_survive_reload(tmp_path):
+    db = Database(str(tmp_path))
+    table = db.create_table(
+        "t", [Field("id", "int", True), Field("f", "double")], 0.01, ["f"])
+    # the CLI inserts raw strings, the CSV reads them back typed
+    table.insert({"id": "1", "f": "2.5"})
+    db.save_table(table)
+
+    loaded = Database(str(tmp_path)).get_table("t")
+    assert loaded.find_row(1) is not None
+    assert loaded.find_rows("f", 2.5) != []
+
+
+def test_stale_bloom_file_is_rejected(tmp_path):
+    db = Database(str(tmp_path))
+    make_table(db, 20)
+    db.save_table(db.get_table("t"))
+
+    # same row count, different key
+    rewrite_csv(tmp_path / "t.csv", b"\r\n7,", b"\r\n7777,")
+
+    loaded = Database(str(tmp_path)).get_table("t")
+    assert loaded.find_row(7777) is not None
+    assert loaded.find_row(7) is None
+
+
+def test_bloom_file_from_older_csv_is_rejected(tmp_path):
+    db = Database(str(tmp_path))
+    table = make_table(db, 20)
+    db.save_table(table)
+    shutil.copy(tmp_path / "t.bloom.json", tmp_path / "old.bloom")
+
+    table.update_row(3, {"v": "new"})
+    db.save_table(table)
+    # as if the process died before the new bloom file was written
+    shutil.copy(tmp_path / "old.bloom", tmp_path / "t.bloom.json")
+
+    loaded = Database(str(tmp_path)).get_table("t")
+    assert loaded.find_rows("v", "new") == [loaded.find_row(3)]
+
+
+def test_drop_table_removes_bloom_file(tmp_path):
+    db = Database(str(tmp_path))
+    make_table(db, 5)
+    db.save_table(db.get_table("t"))
+    assert (tmp_path / "t.bloom.json").is_file()
+    db.drop_table("t")
+    assert not (tmp_path / "t.bloom.json").exists()